@@ -1,9 +1,13 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 
+from snapshot import open_snapshot
+from fundamentals import get_data
+from mem_cache import cache
+from valuation import dcf_value
+
 # --- KONFIGURACIJA STRANICE ---
 st.set_page_config(page_title="Rule #1 Pro Dashboard", layout="wide")
 
@@ -78,20 +82,8 @@ def get_color_class(value, rule_type):
     return "white"
 
 def calculate_dcf(start_val, growth_rate, discount_rate, terminal_multiple, years=10):
-    current = start_val
-    discounted_sum = 0
-    for i in range(1, years + 1):
-        current = current * (1 + growth_rate/100)
-        discounted = current / ((1 + discount_rate/100) ** i)
-        discounted_sum += discounted
-    terminal_val = current * terminal_multiple
-    terminal_discounted = terminal_val / ((1 + discount_rate/100) ** years)
-    return discounted_sum + terminal_discounted
+    return float(dcf_value(start_val, growth_rate, discount_rate, terminal_multiple, years))
 
-@st.cache_data
-def get_data(ticker):
-    stock = yf.Ticker(ticker)
-    return stock.financials, stock.balance_sheet, stock.cashflow, stock.quarterly_financials, stock.quarterly_balance_sheet, stock.quarterly_cashflow, stock.info
 
 # --- SIDEBAR ---
 with st.sidebar:
@@ -99,6 +91,15 @@ with st.sidebar:
     ticker = st.text_input("Simbol:", "CRM").upper()
     graph_period = st.radio("Prikaz Grafova:", ["Godišnje (Annual)", "Kvartalno (Quarterly)"])
     btn = st.button("Skeniraj", type="primary")
+    snap = open_snapshot()
+    if snap is not None:
+        st.caption(f"📦 Izvještaji iz snapshota: {snap.snapshot_date}")
+
+    with st.expander("🧠 Cache (memorija)"):
+        cs = cache.stats()
+        st.caption(f"Zauzeto: {format_num(cs['bytes'])}B / {format_num(cs['max_bytes'])}B ({cs['entries']} unosa)")
+        st.caption(f"Hit rate: {cs['hit_rate']*100:.1f}% (hit {cs['hits']} / miss {cs['misses']})")
+        st.caption(f"Izbačeno: {cs['evictions']} (LRU), {cs['expirations']} (TTL)")
 
 # --- GLAVNI DIO ---
 if btn or ticker:
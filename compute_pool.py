@@ -0,0 +1,180 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from scoring import SCORE_INFO_KEYS, score_ticker
+
+# Koliko komada po radniku - više komada = bolje balansiranje kad su neki simboli sporiji
+CHUNKS_PER_WORKER = 4
+
+# Streamlit server je višenitni proces - fork bi mogao naslijediti zaključane lockove.
+# forkserver pokreće radnike iz čistog procesa.
+MP_CONTEXT = "forkserver"
+
+# Dugoživući pool (jedan po procesu servera), kreira se kod prvog skeniranja
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+# Stanje radnog procesa: priključeni blokovi dijeljene memorije (ime -> (SharedMemory, niz)).
+# Komadi različitih skeniranja (više sesija) se miješaju u istim radnicima, pa je ključ ime bloka.
+_attached = {}
+_stale = []  # zatvoreni blokovi na koje je još pokazivao neki pogled - ponovni pokušaj kasnije
+
+def _frame_values(df):
+    """Izvještaj -> float64 matrica (jedna konverzija cijele matrice)"""
+    try:
+        return df.to_numpy(dtype=np.float64, na_value=np.nan)
+    except (TypeError, ValueError):
+        # Rijetko: tekst u izvještaju
+        return df.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+
+def pack_universe(universe):
+    """
+    Pakira izvještaje svih simbola u jedan blok dijeljene memorije.
+    universe: lista (ticker, info, fin, bal, cf).
+    Vraća (SharedMemory, metas, labels) - metas su mali opisnici (pomaci + id oznaka) koji idu radnicima,
+    a same brojke radnici čitaju izravno iz dijeljene memorije bez pickle-anja DataFrameova.
+    labels: jedinstveni skupovi oznaka redaka/stupaca (većina simbola dijeli iste), indeksirani id-em iz metas.
+    """
+    label_ids = {}
+    labels = []
+
+    def _label_id(idx):
+        key = tuple(idx)
+        if key not in label_ids:
+            label_ids[key] = len(labels)
+            labels.append(key)
+        return label_ids[key]
+
+    packed = []
+    total = 0
+    for ticker, info, fin, bal, cf in universe:
+        small_info = {k: info[k] for k in SCORE_INFO_KEYS if k in info}
+        frames = []
+        for df in (fin, bal, cf):
+            if df is None or df.empty:
+                frames.append((None, (0, 0), _label_id(()), _label_id(()), total))
+                continue
+            values = _frame_values(df)
+            frames.append((values, values.shape, _label_id(df.index), _label_id(df.columns), total))
+            total += values.size
+        packed.append((ticker, small_info, frames))
+
+    shm = shared_memory.SharedMemory(create=True, size=max(total, 1) * 8)
+    flat = np.ndarray((total,), dtype=np.float64, buffer=shm.buf)
+
+    metas = []
+    for ticker, small_info, frames in packed:
+        frame_metas = []
+        for values, shape, index_id, columns_id, offset in frames:
+            if values is not None: flat[offset:offset + values.size] = values.ravel()
+            frame_metas.append((offset, shape, index_id, columns_id))
+        metas.append((ticker, small_info, frame_metas))
+    del flat
+    return shm, metas, labels
+
+def _attach(name, total):
+    """Priključuje blok u radniku (ili vraća već priključeni)"""
+    entry = _attached.get(name)
+    if entry is None:
+        # Radnik dijeli resource tracker s roditeljem, pa je registracija ovdje bezopasna;
+        # roditelj radi unlink kad skeniranje završi.
+        shm = shared_memory.SharedMemory(name=name)
+        values = np.ndarray((total,), dtype=np.float64, buffer=shm.buf)
+        values.flags.writeable = False
+        entry = _attached[name] = (shm, values)
+    return entry[1]
+
+def _detach(name):
+    """Otpušta blok nakon komada - radnik ne drži mapiranu memoriju skeniranja koje je završilo"""
+    _stale.append(_attached.pop(name)[0])
+    for shm in list(_stale):
+        try:
+            shm.close()
+            _stale.remove(shm)
+        except BufferError:
+            pass  # neki pogled je još živ - zatvara se kod sljedećeg komada
+
+def _build_frame(values, indexes, offset, shape, index_id, columns_id):
+    size = shape[0] * shape[1]
+    if size == 0:
+        return pd.DataFrame(index=pd.Index([], dtype=object), dtype=np.float64)
+    view = values[offset:offset + size].reshape(shape)
+    return pd.DataFrame(view, index=indexes[index_id], columns=indexes[columns_id], copy=False)
+
+def _score_frames(values, labels, chunk):
+    # Index objekti se grade jednom po komadu i dijele među simbolima
+    indexes = {i: pd.Index(l) for i, l in labels.items()}
+    rows = []
+    for ticker, info, frame_metas in chunk:
+        try:
+            fin, bal, cf = [_build_frame(values, indexes, *m) for m in frame_metas]
+            rows.append(score_ticker(ticker, info, fin, bal, cf))
+        except Exception:
+            rows.append(None)
+    return rows
+
+def _score_chunk(shm_name, total, labels, chunk):
+    try:
+        # Pogledi na dijeljenu memoriju (DataFrameovi) nestaju s okvirom _score_frames
+        return _score_frames(_attach(shm_name, total), labels, chunk)
+    finally:
+        _detach(shm_name)
+
+def _chunk_labels(chunk, labels):
+    """Samo oznake koje komad stvarno koristi"""
+    used = {i for _, _, frame_metas in chunk for m in frame_metas for i in m[2:]}
+    return {i: labels[i] for i in used}
+
+def _chunks(items, n):
+    size = max(1, -(-len(items) // n))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _get_pool(workers):
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None: _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(MP_CONTEXT))
+            _pool_workers = workers
+        return _pool
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None: _pool.shutdown(wait=False)
+        _pool = None
+
+def score_universe(universe, workers=None):
+    """
+    Boduje cijeli univerzum na više procesa.
+    universe: lista (ticker, info, fin, bal, cf) - podaci su već dohvaćeni (I/O ostaje u glavnom procesu).
+    Vraća retke u istom redoslijedu kao ulaz (None za simbole koji se nisu mogli bodovati).
+    """
+    if not universe: return []
+    workers = workers or os.cpu_count() or 1
+
+    shm, metas, labels = pack_universe(universe)
+    total = shm.size // 8
+    try:
+        chunks = _chunks(metas, workers * CHUNKS_PER_WORKER)
+        pool = _get_pool(workers)
+        try:
+            # map čuva redoslijed komada, pa spajanje vraća izvorni poredak
+            results = pool.map(_score_chunk, [shm.name] * len(chunks), [total] * len(chunks),
+                               [_chunk_labels(c, labels) for c in chunks], chunks)
+            return [row for rows in results for row in rows]
+        except BrokenProcessPool:
+            # Radnik je pao - sljedeće skeniranje dobiva novi pool
+            _reset_pool()
+            raise
+    finally:
+        shm.close()
+        shm.unlink()
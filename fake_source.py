@@ -0,0 +1,101 @@
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# Sintetski izvor podataka (zamjena za yfinance) za load test i mjerenja bez mreže.
+# Server ga koristi kad je postavljen LOADTEST_LATENCY (vidi http_session).
+
+FIN_ROWS = ['Total Revenue', 'Net Income', 'EBIT', 'Pretax Income', 'Interest Expense', 'Basic Average Shares', 'Diluted EPS']
+BAL_ROWS = ['Stockholders Equity', 'Long Term Debt', 'Total Debt', 'Cash And Cash Equivalents', 'Short Term Investments',
+            'Cash Cash Equivalents And Short Term Investments', 'Total Non Current Liabilities Net Minority Interest', 'Ordinary Shares Number']
+CF_ROWS = ['Operating Cash Flow', 'Capital Expenditure', 'Free Cash Flow', 'Cash Dividends Paid']
+
+class FakeTicker:
+    """
+    Zamjena za yf.Ticker: deterministički sintetski podaci po simbolu.
+    Svaki dohvat (izvještaj, info, history) čeka `latency` sekundi, kao jedan HTTP poziv.
+    """
+    latency = 0.2
+
+    def __init__(self, symbol):
+        self.ticker = symbol
+        self._seed = zlib.crc32(symbol.encode())
+
+    def _wait(self):
+        if self.latency: time.sleep(self.latency)
+
+    def _statement(self, rows, periods, freq, salt):
+        self._wait()
+        rng = np.random.default_rng(self._seed + salt)
+        dates = pd.date_range(end=pd.Timestamp("2025-12-31"), periods=periods, freq=freq)[::-1]
+        base = rng.uniform(1e9, 1e11, size=(len(rows), 1))
+        trend = 1 + rng.normal(0.05, 0.1, size=(1, periods)).cumsum(axis=1)[:, ::-1]
+        values = base * trend
+        df = pd.DataFrame(values, index=rows, columns=dates)
+        for r in ('Capital Expenditure', 'Cash Dividends Paid', 'Interest Expense'):
+            if r in df.index: df.loc[r] = -df.loc[r].abs() / 10
+        if 'Diluted EPS' in df.index: df.loc['Diluted EPS'] = df.loc['Net Income'] / 1e9
+        return df
+
+    @property
+    def financials(self): return self._statement(FIN_ROWS, 4, "YE", 1)
+    @property
+    def balance_sheet(self): return self._statement(BAL_ROWS, 4, "YE", 2)
+    @property
+    def cashflow(self): return self._statement(CF_ROWS, 4, "YE", 3)
+    @property
+    def quarterly_financials(self): return self._statement(FIN_ROWS, 5, "QE", 4)
+    @property
+    def quarterly_balance_sheet(self): return self._statement(BAL_ROWS, 5, "QE", 5)
+    @property
+    def quarterly_cashflow(self): return self._statement(CF_ROWS, 5, "QE", 6)
+
+    @property
+    def info(self):
+        self._wait()
+        rng = np.random.default_rng(self._seed)
+        price = float(rng.uniform(10, 500))
+        shares = float(rng.uniform(1e8, 1e10))
+        info = {
+            'shortName': f"{self.ticker} Inc.", 'sector': 'Technology', 'industry': 'Software',
+            'currentPrice': price, 'previousClose': price * float(rng.uniform(0.97, 1.03)),
+            'marketCap': price * shares, 'sharesOutstanding': shares,
+            'trailingEps': price / 25, 'trailingPE': 25.0, 'forwardPE': 20.0, 'bookValue': price / 5,
+            'priceToBook': 5.0, 'priceToSalesTrailing12Months': 6.0, 'pegRatio': 1.5,
+            'totalRevenue': shares * 50, 'netIncomeToCommon': shares * 5, 'freeCashflow': shares * 6,
+            'totalCash': shares * 10, 'totalDebt': shares * 8,
+            'profitMargins': 0.1, 'operatingMargins': 0.15, 'grossMargins': 0.6,
+            'returnOnEquity': 0.15, 'returnOnAssets': 0.07, 'debtToEquity': 80.0,
+            'quickRatio': 1.1, 'currentRatio': 1.4, 'dividendRate': 1.0, 'dividendYield': 0.01,
+            'payoutRatio': 0.3, 'earningsGrowth': 0.12, 'recommendationKey': 'buy',
+        }
+        # Sličan volumen kao pravi info (~150 ključeva)
+        info.update({f"field{i}": float(i) for i in range(120)})
+        return info
+
+    def history(self, period="1y"):
+        self._wait()
+        return self._history(period)
+
+    def _history(self, period):
+        # "5d", "1mo", "2y" -> broj radnih dana
+        for suffix, days in (("mo", 21), ("d", 1), ("y", 252)):
+            if period.endswith(suffix):
+                periods = int(period[:-len(suffix)]) * days
+                break
+        rng = np.random.default_rng(self._seed)
+        idx = pd.bdate_range(end=pd.Timestamp("2025-12-31"), periods=periods)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(idx))))
+        return pd.DataFrame({
+            'Open': close * 0.995, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+            'Volume': rng.integers(1_000_000, 10_000_000, len(idx)),
+        }, index=idx)
+
+    @classmethod
+    def download(cls, tickers, period="5d"):
+        """Zamjena za yf.download: jedan poziv (jedna latencija) za sve simbole"""
+        if cls.latency: time.sleep(cls.latency)
+        frames = {t: cls(t)._history(period) for t in tickers}
+        return pd.concat(frames, axis=1).swaplevel(axis=1)
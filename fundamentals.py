@@ -0,0 +1,22 @@
+from http_session import get_ticker, run
+from mem_cache import cached
+from snapshot import open_snapshot
+
+# Dohvat podataka za jedan simbol, zajednički glavnoj stranici i stranicama (isti cache u procesu).
+
+@cached("statements")
+def get_statements(ticker):
+    """(financials, balance_sheet, cashflow, quarterly_financials, quarterly_balance_sheet, quarterly_cashflow)"""
+    # Izvještaji iz dnevnog snapshota ako ga ima
+    snap = open_snapshot()
+    if snap is not None and ticker in snap:
+        return snap.statements(ticker)
+    stock = get_ticker(ticker)
+    return run(lambda: (stock.financials, stock.balance_sheet, stock.cashflow, stock.quarterly_financials, stock.quarterly_balance_sheet, stock.quarterly_cashflow))
+
+@cached("info")
+def get_info(ticker):
+    return run(lambda: get_ticker(ticker).info)
+
+def get_data(ticker):
+    return (*get_statements(ticker), get_info(ticker))
@@ -0,0 +1,148 @@
+import itertools
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import yfinance as yf
+
+# Jedna dijeljena HTTP sesija za sve yfinance pozive u procesu.
+# Keep-alive veze, kolačić i crumb ostaju u sesiji pa se ne pregovaraju iznova za svaki simbol.
+POOL_MAXSIZE = 16       # broj dugoživućih HTTP niti za batch dohvate (map_tickers)
+INTERACTIVE_WORKERS = 4 # zasebne niti za pojedinačne dohvate (run) - ne čekaju iza nečijeg skeniranja
+MAP_WINDOW = POOL_MAXSIZE  # max zadataka u tijeku po jednom map_tickers pozivu
+MAX_RETRIES = 2         # samo za requests varijantu (ponovni pokušaj na pucanje veze)
+
+_lock = threading.Lock()
+_session = None
+_ticker_factory = None  # zamjenski izvor podataka (npr. loadtest.py), None = yfinance
+
+# curl_cffi drži jedan curl handle (i njegov cache veza/TLS sesija) po niti. Zato svi dohvati idu
+# kroz fiksne skupove dugoživućih niti - veze preživljavaju između skeniranja i rerunova stranica,
+# umjesto da umru s nitima jednokratnog executora ili Streamlit script threada.
+# Dva skupa: batch (skeniranja) i interaktivni (dashboard, graf), da jedan veliki sken ne blokira ostale sesije.
+_batch_executor = None
+_interactive_executor = None
+_tls = threading.local()
+
+def _new_session():
+    try:
+        # Novije verzije yfinance traže curl_cffi sesiju
+        from curl_cffi import requests as curl_requests
+    except ImportError:
+        curl_requests = None
+
+    if curl_requests is not None:
+        class BoundedSession(curl_requests.Session):
+            """curl_cffi sesija s ograničenim brojem istovremenih zahtjeva (i izvan HTTP niti, npr. yf.download)"""
+            _slots = threading.BoundedSemaphore(POOL_MAXSIZE + INTERACTIVE_WORKERS)
+
+            def request(self, *args, **kwargs):
+                with self._slots:
+                    return super().request(*args, **kwargs)
+
+        return BoundedSession(impersonate="chrome")
+
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    # pool_block=True: kad je pool pun, nit čeka slobodnu vezu umjesto da otvara novu
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE + INTERACTIVE_WORKERS, pool_block=True, max_retries=MAX_RETRIES)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def get_session():
+    """Dijeljena sesija (kreira se jednom, thread-safe)"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _new_session()
+    return _session
+
+def set_ticker_factory(factory):
+    """Preusmjerava get_ticker na zamjenski izvor (factory(symbol) -> objekt sa sučeljem yf.Ticker). None vraća yfinance."""
+    global _ticker_factory
+    _ticker_factory = factory
+
+def get_ticker(symbol):
+    """yf.Ticker koji ide kroz dijeljenu sesiju - koristiti umjesto yf.Ticker(symbol)"""
+    if _ticker_factory is not None:
+        return _ticker_factory(symbol)
+    return yf.Ticker(symbol, session=get_session())
+
+def download(tickers, period="5d", **kwargs):
+    """
+    yf.download kroz dijeljenu sesiju - koristiti umjesto yf.download.
+    Sa zamjenskim izvorom: factory.download(tickers, period) ako postoji, inače history() po simbolu,
+    složeno u isti oblik kao yf.download (stupci: polje, simbol).
+    """
+    tickers = list(tickers)
+    if _ticker_factory is not None:
+        if hasattr(_ticker_factory, "download"):
+            return _ticker_factory.download(tickers, period=period)
+        frames = {t: _ticker_factory(t).history(period=period) for t in tickers}
+        return pd.concat(frames, axis=1).swaplevel(axis=1)
+    return yf.download(tickers, period=period, session=get_session(), **kwargs)
+
+def _mark_http_thread():
+    _tls.http_thread = True
+
+def _get_executors():
+    global _batch_executor, _interactive_executor
+    if _batch_executor is None:
+        with _lock:
+            if _batch_executor is None:
+                _interactive_executor = ThreadPoolExecutor(max_workers=INTERACTIVE_WORKERS, thread_name_prefix="http",
+                                                           initializer=_mark_http_thread)
+                _batch_executor = ThreadPoolExecutor(max_workers=POOL_MAXSIZE, thread_name_prefix="http-batch",
+                                                     initializer=_mark_http_thread)
+    return _batch_executor, _interactive_executor
+
+def run(fn, *args, **kwargs):
+    """
+    Izvršava fn na jednoj od dugoživućih interaktivnih HTTP niti i vraća rezultat (greške se propagiraju).
+    Za pojedinačne dohvate iz Streamlit skripti, čiji se thread mijenja na svakom rerunu.
+    """
+    if getattr(_tls, "http_thread", False):
+        # Već smo na HTTP niti - izravno, da ugniježđeni poziv ne čeka sam sebe
+        return fn(*args, **kwargs)
+    return _get_executors()[1].submit(fn, *args, **kwargs).result()
+
+def map_tickers(fn, symbols):
+    """
+    Poziva fn(symbol) za sve simbole na dugoživućim batch HTTP nitima (dijeljena sesija).
+    Vraća generator (symbol, rezultat, greška) istim redoslijedom kao ulaz,
+    pa pozivatelj može osvježavati progress bar kako rezultati stižu.
+    U redu čeka najviše MAP_WINDOW zadataka po pozivu (više skeniranja dijeli niti naizmjence),
+    a kad pozivatelj prestane čitati (rerun, Stop, close()) preostali zadaci se otkazuju.
+    fn se izvršava izvan Streamlit konteksta - ne smije pozivati st.*.
+    """
+    def _safe(symbol):
+        try:
+            return symbol, fn(symbol), None
+        except Exception as e:
+            return symbol, None, e
+
+    if getattr(_tls, "http_thread", False):
+        for symbol in symbols: yield _safe(symbol)
+        return
+    executor = _get_executors()[0]
+    symbols = iter(symbols)
+    pending = deque(executor.submit(_safe, s) for s in itertools.islice(symbols, MAP_WINDOW))
+    try:
+        while pending:
+            result = pending.popleft().result()
+            # Dopuna prije yielda, da niti rade dok pozivatelj obrađuje rezultat
+            for s in itertools.islice(symbols, 1): pending.append(executor.submit(_safe, s))
+            yield result
+    finally:
+        for f in pending: f.cancel()
+
+# Load test (loadtest.py): server pokrenut s LOADTEST_LATENCY=<s> koristi sintetski izvor umjesto Yahooa
+if os.environ.get("LOADTEST_LATENCY"):
+    from fake_source import FakeTicker
+    FakeTicker.latency = float(os.environ["LOADTEST_LATENCY"])
+    set_ticker_factory(FakeTicker)
@@ -0,0 +1,232 @@
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+from compute_pool import score_universe
+from fake_source import FakeTicker
+from scoring import score_ticker
+
+# Load test: jedan pravi `streamlit run app.py` server (sa sintetskim izvorom podataka, LOADTEST_LATENCY)
+# i N istovremenih websocket klijenata koji govore Streamlit protokolom kao preglednik.
+# Sve sesije dijele cache, HTTP niti, compute pool i GIL servera - kao u produkciji.
+# Mjeri se samo rerun akcije (unos simbola / klik), ne otvaranje stranice; RSS je RSS procesa servera.
+#
+#   python loadtest.py --concurrency 1 5 10 20 --duration 30 --latency 0.2
+#   python loadtest.py --pool-workers 1 2 4 --universe 2000    # samo bodovanje (compute_pool)
+
+ROOT = Path(__file__).parent
+# Stranica -> page_name (url_pathname u navigaciji)
+PAGES = {
+    "dashboard": "",
+    "screener": "Screener",
+    "technical": "Technical",
+    "comparison": "Comparison",
+}
+# Statusi script_finished koji nisu uspješan kraj (FINISHED_WITH_COMPILE_ERROR)
+_FAILED = {1}
+
+def _rss_mb(pid):
+    """Trenutni RSS procesa (MB), 0 ako proces više ne postoji"""
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+def start_server(port, latency, timeout=60):
+    """Pokreće server sa sintetskim izvorom i čeka health check"""
+    env = dict(os.environ, LOADTEST_LATENCY=str(latency))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", str(ROOT / "app.py"),
+         "--server.headless=true", f"--server.port={port}", "--server.enableXsrfProtection=false",
+         "--server.fileWatcherType=none", "--browser.gatherUsageStats=false"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server se srušio pri pokretanju (kod {proc.returncode})")
+        try:
+            urllib.request.urlopen(f"http://localhost:{port}/_stcore/health", timeout=1)
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("Server se nije pokrenuo")
+
+async def _rerun(ws, page_name, widgets=(), timeout=120):
+    """Jedan rerun skripte; vraća [(vrsta, id widgeta)] redom kako su iscrtani. Greška skripte -> RuntimeError"""
+    msg = BackMsg()
+    msg.rerun_script.query_string = ""
+    msg.rerun_script.page_name = page_name
+    msg.rerun_script.widget_states.widgets.extend(widgets)
+    await ws.send(msg.SerializeToString())
+
+    found, error = [], None
+    while True:
+        fwd = ForwardMsg()
+        fwd.ParseFromString(await asyncio.wait_for(ws.recv(), timeout))
+        kind = fwd.WhichOneof("type")
+        if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+            element = fwd.delta.new_element
+            etype = element.WhichOneof("type")
+            if etype == "exception": error = error or element.exception.message
+            elif hasattr(getattr(element, etype), "id"): found.append((etype, getattr(element, etype).id))
+        elif kind == "script_finished":
+            if fwd.script_finished in _FAILED: error = error or "compile error"
+            if error: raise RuntimeError(error)
+            return found
+
+def _widget(found, etype, n=0):
+    return [wid for t, wid in found if t == etype][n]
+
+def _action(page, found, universe):
+    """Stanja widgeta za glavnu akciju stranice"""
+    if page in ("dashboard", "technical"):
+        return [WidgetState(id=_widget(found, "text_input"), string_value=random.choice(universe))]
+    if page == "screener":
+        return [WidgetState(id=_widget(found, "text_area"), string_value=", ".join(random.sample(universe, 10))),
+                WidgetState(id=_widget(found, "button"), trigger_value=True)]
+    return [WidgetState(id=_widget(found, "text_input"), string_value=", ".join(random.sample(universe, 6))),
+            WidgetState(id=_widget(found, "button"), trigger_value=True)]
+
+async def _session(page, universe, port, timeout):
+    """Jedna simulirana sesija: otvori stranicu, odradi glavnu akciju. Vraća trajanje reruna akcije (s)"""
+    async with websockets.connect(f"ws://localhost:{port}/_stcore/stream", subprotocols=["streamlit"],
+                                  max_size=None, open_timeout=timeout) as ws:
+        found = await _rerun(ws, PAGES[page], timeout=timeout)
+        widgets = _action(page, found, universe)
+        t0 = time.perf_counter()
+        await _rerun(ws, PAGES[page], widgets, timeout)
+        return time.perf_counter() - t0
+
+async def _level(concurrency, duration, pages, universe, port, timeout, server_pid):
+    latencies = {p: [] for p in pages}
+    errors = 0
+    peak_rss = _rss_mb(server_pid)
+    deadline = time.monotonic() + duration
+
+    async def client():
+        nonlocal errors
+        while time.monotonic() < deadline:
+            page = random.choice(pages)
+            try:
+                latencies[page].append(await _session(page, universe, port, timeout))
+            except Exception:
+                errors += 1
+                await asyncio.sleep(0.5)
+
+    clients = asyncio.gather(*(client() for _ in range(concurrency)))
+    while not clients.done():
+        peak_rss = max(peak_rss, _rss_mb(server_pid))
+        await asyncio.wait([clients], timeout=0.5)
+    await clients
+    return latencies, errors, peak_rss
+
+def run_level(concurrency, duration, pages, universe, port, timeout, server_pid):
+    """`concurrency` klijenata vrti sesije `duration` sekundi. Vraća (latencije akcija po stranici, broj grešaka, vršni RSS servera)"""
+    return asyncio.run(_level(concurrency, duration, pages, universe, port, timeout, server_pid))
+
+def _universe_frames(universe):
+    """(ticker, info, fin, bal, cf) za bodovanje, bez latencije"""
+    latency, FakeTicker.latency = FakeTicker.latency, 0
+    try:
+        return [(t, f.info, f.financials, f.balance_sheet, f.cashflow) for t, f in ((t, FakeTicker(t)) for t in universe)]
+    finally:
+        FakeTicker.latency = latency
+
+def pool_benchmark(universe, workers_list, scans=2):
+    """
+    Propusnost bodovanja (simbola/s): serijski, compute_pool s N radnika,
+    i `scans` istovremenih skeniranja na dijeljenom poolu (više sesija odjednom).
+    """
+    frames = _universe_frames(universe)
+    rows = []
+    t0 = time.perf_counter()
+    for row in frames: score_ticker(*row)
+    elapsed = time.perf_counter() - t0
+    rows.append({"način": "serijski", "radnika": 1, "s": elapsed, "simbola/s": len(frames) / elapsed})
+
+    for workers in workers_list:
+        score_universe(frames[:workers * 4], workers)  # zagrijavanje: pokretanje radnika
+        t0 = time.perf_counter()
+        score_universe(frames, workers)
+        elapsed = time.perf_counter() - t0
+        rows.append({"način": "pool", "radnika": workers, "s": elapsed, "simbola/s": len(frames) / elapsed})
+
+        with ThreadPoolExecutor(scans) as ex:
+            t0 = time.perf_counter()
+            list(ex.map(lambda _: score_universe(frames, workers), range(scans)))
+            elapsed = time.perf_counter() - t0
+        rows.append({"način": f"pool x{scans} sesije", "radnika": workers, "s": elapsed, "simbola/s": scans * len(frames) / elapsed})
+    report(rows)
+
+def report(rows):
+    df = pd.DataFrame(rows)
+    print(df.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test Streamlit stranica (zamjenski izvor podataka)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 5, 10, 20], help="Broj istovremenih sesija (više razina)")
+    parser.add_argument("--duration", type=float, default=30, help="Trajanje svake razine (s)")
+    parser.add_argument("--latency", type=float, default=0.2, help="Latencija po pozivu izvora podataka (s)")
+    parser.add_argument("--pages", nargs="+", default=list(PAGES), choices=list(PAGES))
+    parser.add_argument("--universe", type=int, default=200, help="Broj različitih simbola (manje = više cache pogodaka)")
+    parser.add_argument("--timeout", type=float, default=120, help="Timeout jednog izvođenja skripte (s)")
+    parser.add_argument("--port", type=int, default=8599, help="Port servera pod testom")
+    parser.add_argument("--pool-workers", type=int, nargs="+", help="Umjesto sesija: propusnost compute_poola za zadane brojeve radnika")
+    args = parser.parse_args()
+
+    universe = [f"T{i:04d}" for i in range(args.universe)]
+    if args.pool_workers:
+        pool_benchmark(universe, args.pool_workers)
+        return
+
+    server = start_server(args.port, args.latency)
+    try:
+        base_rss = _rss_mb(server.pid)
+        # Zagrijavanje: prvi uvoz svake stranice ne ulazi u mjerenje
+        for page in args.pages:
+            asyncio.run(_session(page, universe, args.port, args.timeout))
+
+        rows = []
+        for c in args.concurrency:
+            print(f"--- {c} istovremenih sesija, {args.duration:.0f}s ---")
+            latencies, errors, peak_rss = run_level(c, args.duration, args.pages, universe, args.port, args.timeout, server.pid)
+            total = sum(len(v) for v in latencies.values())
+            for page, lat in latencies.items():
+                if not lat: continue
+                p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+                rows.append({
+                    "sessions": c, "page": page, "runs": len(lat),
+                    "p50 s": p50, "p95 s": p95, "p99 s": p99,
+                    "runs/s": len(lat) / args.duration,
+                })
+            rows.append({
+                "sessions": c, "page": "UKUPNO", "runs": total, "errors": errors,
+                "runs/s": total / args.duration, "RSS MB": peak_rss, "RSS +MB": peak_rss - base_rss,
+            })
+        print()
+        report(rows)
+    finally:
+        server.terminate()
+        server.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import functools
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+# In-memory cache zajednički svim sesijama u procesu, s budžetom u bajtovima.
+# Izbacuje najdulje nekorištene unose (LRU) prema izmjerenoj veličini objekta, a svaki dataset ima svoj TTL.
+MAX_BYTES = 512 * 1024 * 1024
+
+# TTL po datasetu (sekunde). None = bez isteka (samo LRU).
+DATASET_TTL = {
+    "statements": 12 * 3600,  # izvještaji se mijenjaju kvartalno
+    "info": 15 * 60,          # cijena i omjeri
+}
+
+def measure_size(obj, _seen=None):
+    """Približna veličina objekta u bajtovima (DataFrame deep, rječnici/liste rekurzivno)"""
+    if _seen is None: _seen = set()
+    if id(obj) in _seen: return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True, index=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True, index=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(measure_size(k, _seen) + measure_size(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(measure_size(v, _seen) for v in obj)
+    return size
+
+class MemoryCache:
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._inflight = {}            # key -> Future (dohvat u tijeku)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key):
+        """Vraća (True, vrijednost) ili (False, None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and entry[2] <= time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key, value, ttl=None):
+        size = measure_size(value)
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            if key in self._entries: self._drop(key)
+            # Objekt veći od cijelog budžeta ne spremamo
+            if size > self.max_bytes: return
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def get_or_compute(self, key, fn, ttl=None):
+        """
+        Vraća vrijednost iz cachea ili je izračuna s fn().
+        Istovremeni promašaji istog ključa čekaju jedan te isti izračun (npr. više sesija otvori isti simbol).
+        """
+        hit, value = self.get(key)
+        if hit: return value
+
+        with self._lock:
+            # Izračun je mogao završiti između get() i ovog locka
+            entry = self._entries.get(key)
+            if entry is not None and (entry[2] is None or entry[2] > time.monotonic()):
+                return entry[0]
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            value = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self.put(key, value, ttl)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+cache = MemoryCache()
+
+def cached(dataset):
+    """
+    Dekorator: rezultat funkcije ide u zajednički cache pod TTL-om dataseta.
+    Vraća se ISTI objekt svim pozivateljima (ne kopija kao st.cache_data) - ne mijenjati ga.
+    """
+    ttl = DATASET_TTL.get(dataset)
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (dataset, fn.__module__, fn.__qualname__, args, tuple(sorted(kwargs.items())))
+            return cache.get_or_compute(key, lambda: fn(*args, **kwargs), ttl)
+        return wrapper
+    return decorator
@@ -1,7 +1,14 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 
+from scoring import score_ticker
+from compute_pool import score_universe
+from snapshot import STATEMENTS, fetch_statements, open_snapshot
+from valuation import valuation_inputs, valuation_table
+from ui import VALUATION_COLUMNS
+from ttm import bulk_prices, derive_ttm, ttm_infos
+from http_session import get_ticker, map_tickers
+
 st.set_page_config(page_title="Batch Screener", layout="wide")
 
 st.title("🔍 Batch Screener (Smart Data)")
@@ -19,48 +26,18 @@ with col_in1:
 with col_in2:
     st.markdown("<br>", unsafe_allow_html=True)
     scan_btn = st.button("🚀 Pokreni Skener", type="primary", use_container_width=True)
-
-# --- PAMETNA FUNKCIJA ZA TRAŽENJE VRIJEDNOSTI ---
-def get_historical_value(df, keys_list, col_idx=-1):
-    """
-    Traži vrijednost u df. Ako ne nađe u zadnjem stupcu (najstarijem),
-    pokušava stupac prije njega.
-    keys_list: lista mogućih naziva redaka.
-    """
-    if df.empty: return None
-    
-    # Iteriraj kroz stupce od najstarijeg (-1) prema novijem
-    # Da izbjegnemo situaciju gdje je zadnja godina prazna (NaN)
-    num_cols = len(df.columns)
-    check_cols = range(num_cols - 1, -1, -1) # npr. 4, 3, 2, 1, 0
-    
-    # Prvo probaj naći redak
-    found_row = None
-    for k in keys_list:
-        # Case insensitive match
-        matches = df.index[df.index.str.contains(k, case=False, regex=False)]
-        if len(matches) > 0:
-            found_row = matches[0]
-            break
-    
-    if found_row:
-        # Sada traži prvu valjanu vrijednost u tom retku (odostraga)
-        row_data = df.loc[found_row]
-        for i in range(1, len(row_data)+1):
-            val = row_data.iloc[-i]
-            if pd.notna(val) and val != 0:
-                return val
-    return None
-
-def get_total_cash_history(bal):
-    """Zbraja Cash + Short Term Investments za povijest"""
-    c1 = get_historical_value(bal, ['Cash And Cash Equivalents', 'Cash'])
-    c2 = get_historical_value(bal, ['Short Term Investments', 'Other Short Term Investments'])
-    
-    total = 0
-    if c1: total += c1
-    if c2: total += c2
-    return total if total > 0 else None
+    fast_mode = st.checkbox("🏎️ Brzi način (TTM iz kvartala)", help="TTM brojke iz zadnja 4 kvartala i cijene jednim pozivom; stock.info samo kao fallback.")
+    use_pool = st.checkbox("⚡ Paralelni izračun", help="Bodovanje na više procesa (za velike liste simbola).")
+    show_val = st.checkbox("💰 Batch valuacija", help="DCF, Lynch, Graham i Rule #1 Sticker/MOS za sve simbole.")
+
+if show_val:
+    with st.expander("🧮 Parametri valuacije", expanded=True):
+        v1, v2, v3, v4 = st.columns(4)
+        val_auto = v1.checkbox("Automatski rast", value=True, help="Povijesni rast EPS-a po simbolu")
+        val_growth = v1.number_input("Rast (%):", value=15.0, step=1.0, disabled=val_auto)
+        val_disc = v2.number_input("Diskontna stopa (%):", value=10.0, step=0.5)
+        val_tpe = v3.number_input("Terminalni P/E:", value=15.0, step=1.0)
+        val_fpe = v4.number_input("Budući P/E (Rule #1):", value=30.0, step=1.0)
 
 # --- LOGIKA SKENERA ---
 if scan_btn:
@@ -73,158 +50,72 @@ if scan_btn:
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        for i, ticker in enumerate(tickers_list):
-            status_text.text(f"Analiziram: {ticker} ({i+1}/{len(tickers_list)})...")
-            
-            try:
-                stock = yf.Ticker(ticker)
-                info = stock.info
-                
-                # Provjera podataka
-                if not info or 'currentPrice' not in info:
-                    raise Exception("No Data")
-
-                fin = stock.financials
-                bal = stock.balance_sheet
-                cf = stock.cashflow
-                
-                if not fin.empty:
-                    p = {} 
-                    
-                    # --- TRENUTNI PODACI (TTM/MRQ) ---
-                    rev_ttm = info.get('totalRevenue')
-                    # Fallback za Net Income (ako nema u info, uzmi iz fin)
-                    net_inc_ttm = info.get('netIncomeToCommon')
-                    if net_inc_ttm is None: 
-                        net_inc_ttm = get_historical_value(fin, ['Net Income'], 0) # 0 = najnovije
-
-                    cash_ttm = info.get('totalCash')
-                    debt_ttm = info.get('totalDebt')
-                    mkt_cap = info.get('marketCap', 0)
-                    pe = info.get('trailingPE', 0)
-                    if pe is None: pe = 0
-                    
-                    # --- POVIJESNI PODACI ---
-                    rev_old = get_historical_value(fin, ['Total Revenue', 'Operating Revenue'])
-                    ni_old = get_historical_value(fin, ['Net Income', 'Net Income Common'])
-                    
-                    # Total Cash History (Sumirano)
-                    cash_old = get_total_cash_history(bal)
-                    
-                    # Shares History (Iz Income Statementa je najsigurnije)
-                    shares_old = get_historical_value(fin, ['Basic Average Shares', 'Diluted Average Shares'])
-
-                    # --- IZRAČUN PILLARA ---
-
-                    # 1. REVENUE GROWTH
-                    if rev_ttm and rev_old:
-                        p['Rev Growth'] = (rev_ttm >= rev_old)
-                    else: p['Rev Growth'] = False
-
-                    # 2. NET INCOME GROWTH
-                    if net_inc_ttm is not None and ni_old is not None:
-                         # Pazimo na minus
-                         if ni_old < 0 and net_inc_ttm > ni_old: p['Net Inc Growth'] = True
-                         else: p['Net Inc Growth'] = (net_inc_ttm >= ni_old)
-                    else: p['Net Inc Growth'] = False
-
-                    # 3. CASH GROWTH
-                    if cash_ttm is not None and cash_old is not None:
-                        p['Cash Growth'] = (cash_ttm >= cash_old)
-                    else: p['Cash Growth'] = False
-
-                    # 4. REPAY DEBT (Cash > LT Debt)
-                    lt_debt = get_historical_value(bal, ['Long Term Debt'], 0)
-                    if lt_debt is None: lt_debt = 0
-                    
-                    if cash_ttm is not None:
-                        p['Cash > Debt'] = (cash_ttm >= lt_debt)
-                    else: p['Cash > Debt'] = False
-                    
-                    # 5. REPAY LIABILITIES
-                    liab_old = get_historical_value(bal, ['Total Non Current Liabilities'], 0)
-                    if cash_ttm is not None and liab_old is not None:
-                        p['Cash > Liab'] = (cash_ttm >= liab_old)
-                    else: p['Cash > Liab'] = False
-                    
-                    # 6. PE RATIO
-                    p['PE < 22.5'] = (0 < pe < 22.5)
-                    
-                    # 7. ROIC > 9% (AVG)
-                    try:
-                        roic_sum = 0
-                        cnt = 0
-                        years = min(5, len(fin.columns))
-                        for y in range(years):
-                            # Koristimo iloc direktno za brzinu
-                            ebit = fin.loc['EBIT'].iloc[y] if 'EBIT' in fin.index else fin.loc['Pretax Income'].iloc[y]
-                            equity = bal.loc['Stockholders Equity'].iloc[y] if 'Stockholders Equity' in bal.index else 0
-                            
-                            d_val = 0
-                            if 'Total Debt' in bal.index: d_val = bal.loc['Total Debt'].iloc[y]
-                            
-                            if equity != 0:
-                                roic_sum += (ebit / (equity + d_val))
-                                cnt += 1
-                        
-                        if cnt > 0:
-                            p['ROIC > 9%'] = ((roic_sum / cnt) * 100 > 9)
-                        else:
-                            # Fallback na ROE
-                            p['ROIC > 9%'] = (info.get('returnOnEquity', 0) > 0.09)
-                    except:
-                        p['ROIC > 9%'] = False
-                    
-                    # 8. SHARE BUYBACK
-                    shares_now = info.get('sharesOutstanding')
-                    # AMZN: 2021 (~10B split adj) -> 2024 (~10.5B). Povećali su broj dionica.
-                    # Dakle, za AMZN ovo MORA biti Crveno (False).
-                    # Ako želimo biti blagi (npr. rast manji od 1%), možemo dodati buffer.
-                    # Ali Rule #1 je strog.
-                    if shares_now and shares_old:
-                        p['Buyback'] = (shares_now <= shares_old * 1.01) # Dozvoli 1% rasta (SBC)
-                    else:
-                        p['Buyback'] = False
-                    
-                    # 9. VALUATION
-                    fcf_ttm = info.get('freeCashflow')
-                    if fcf_ttm is None and not cf.empty:
-                         # Calc manual
-                         op = cf.loc['Operating Cash Flow'].iloc[0] if 'Operating Cash Flow' in cf.index else 0
-                         cap = cf.loc['Capital Expenditure'].iloc[0] if 'Capital Expenditure' in cf.index else 0
-                         fcf_ttm = op + cap
-                    
-                    if fcf_ttm and mkt_cap:
-                        p['Undervalued'] = ((fcf_ttm * 20) > mkt_cap)
-                    else: p['Undervalued'] = False
-                    
-                    # 10. DIVIDEND
-                    div_rate = info.get('dividendRate', 0)
-                    if div_rate is None or div_rate == 0:
-                        p['Div Safety'] = True
-                    else:
-                        payout = info.get('payoutRatio', 0)
-                        p['Div Safety'] = (payout is not None and payout < 0.90)
-
-                    # --- FINISH ---
-                    score = sum([1 for v in p.values() if v])
-                    comp_name = info.get('shortName', ticker)
-                    
-                    row_data = {
-                        "Ticker": ticker,
-                        "Name": comp_name,
-                        "Score (Max 10)": score,
-                    }
-                    for k, v in p.items():
-                        row_data[k] = "✅" if v else "❌"
-                    
-                    results.append(row_data)
-
-            except Exception as e:
-                # st.write(e) # Debug
-                pass
-            
-            progress_bar.progress((i + 1) / len(tickers_list))
+        universe = []
+        # Dnevni snapshot izvještaja (memory-map), ako postoji
+        snap = open_snapshot()
+
+        def load_statements(ticker, names=STATEMENTS):
+            if snap is not None and ticker in snap:
+                return {name: snap.statement(ticker, name) for name in names}
+            return fetch_statements(ticker, names)
+
+        def fetch_info(ticker):
+            info = get_ticker(ticker).info
+            # Provjera podataka
+            if not info or 'currentPrice' not in info:
+                raise Exception("No Data")
+            return info
+
+        def fetch_ticker(ticker):
+            # Izvršava se u pozadinskoj niti - bez st.* poziva
+            info = fetch_info(ticker)
+            s = load_statements(ticker, ('financials', 'balance_sheet', 'cashflow'))
+            return info, s['financials'], s['balance_sheet'], s['cashflow']
+
+        if fast_mode:
+            # 1. Samo izvještaji (bez stock.info)
+            statements = {}
+            for i, (ticker, fetched, err) in enumerate(map_tickers(load_statements, tickers_list)):
+                status_text.text(f"Dohvaćam izvještaje: {ticker} ({i+1}/{len(tickers_list)})...")
+                if err is None: statements[ticker] = fetched
+                progress_bar.progress((i + 1) / len(tickers_list))
+
+            # 2. TTM iz kvartala + cijene jednim pozivom
+            status_text.text("Računam TTM iz kvartalnih izvještaja...")
+            ttm = derive_ttm({t: (s['quarterly_financials'], s['quarterly_balance_sheet'], s['quarterly_cashflow']) for t, s in statements.items()})
+            try: prices = bulk_prices(list(statements))
+            except Exception: prices = pd.Series(dtype=float)
+            infos = ttm_infos(ttm, prices)
+
+            # 3. Fallback na stock.info samo za simbole bez kompletnih kvartalnih podataka
+            missing = [t for t in statements if t not in infos]
+            if missing:
+                status_text.text(f"Dohvaćam info za {len(missing)} dionica bez kvartalnih podataka...")
+                for ticker, info, err in map_tickers(fetch_info, missing):
+                    if err is None: infos[ticker] = info
+
+            for ticker in tickers_list:
+                if ticker in statements and ticker in infos:
+                    s = statements[ticker]
+                    universe.append((ticker, infos[ticker], s['financials'], s['balance_sheet'], s['cashflow']))
+        else:
+            # Dohvat ide paralelno kroz dijeljenu HTTP sesiju, rezultati stižu redom
+            for i, (ticker, fetched, err) in enumerate(map_tickers(fetch_ticker, tickers_list)):
+                status_text.text(f"Analiziram: {ticker} ({i+1}/{len(tickers_list)})...")
+                if err is None: universe.append((ticker, *fetched))
+                progress_bar.progress((i + 1) / len(tickers_list))
+        
+        if use_pool and universe:
+            status_text.text(f"Bodujem {len(universe)} dionica na više procesa...")
+            results = [r for r in score_universe(universe) if r]
+        else:
+            for ticker, info, fin, bal, cf in universe:
+                try:
+                    row_data = score_ticker(ticker, info, fin, bal, cf)
+                    if row_data: results.append(row_data)
+                except Exception as e:
+                    # st.write(e) # Debug
+                    pass
         
         status_text.empty()
         progress_bar.empty()
@@ -232,8 +123,12 @@ if scan_btn:
         if results:
             df = pd.DataFrame(results)
             df = df.sort_values(by="Score (Max 10)", ascending=False)
+            # Brzi način: naziv samo za simbole koji su išli na stock.info (TTM nema naziv tvrtke)
+            if fast_mode: df["Name"] = df["Ticker"].map(lambda t: infos[t].get('shortName', ''))
             
             st.success(f"Analizirano {len(results)} dionica.")
+            if snap is not None:
+                st.caption(f"📦 Izvještaji iz snapshota: {snap.snapshot_date} (simboli kojih nema u snapshotu dohvaćeni uživo)")
             st.dataframe(
                 df,
                 hide_index=True,
@@ -245,6 +140,18 @@ if scan_btn:
                 }
             )
             
+            if show_val:
+                st.subheader("💰 Batch Valuacija")
+                scored = set(df["Ticker"])
+                inputs = pd.DataFrame([valuation_inputs(t, info, fin, bal) for t, info, fin, bal, cf in universe if t in scored])
+                val_df = valuation_table(inputs, val_disc, val_tpe, val_fpe, growth=None if val_auto else val_growth)
+                st.dataframe(
+                    df[["Ticker"]].merge(val_df.drop_duplicates("Ticker"), on="Ticker", how="left"),
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config=VALUATION_COLUMNS,
+                )
+
             st.markdown("---")
             st.caption("Napomena: Cash Growth sada zbraja (Cash + Short Term Investments). Buyback gleda Basic Average Shares iz Income Statementa.")
         else:
@@ -1,9 +1,10 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from http_session import get_ticker, run
+
 st.set_page_config(page_title="Tehnička Analiza", layout="wide")
 
 st.title("📉 Tehnička Analiza & Tajming")
@@ -17,8 +18,8 @@ with c2:
 
 if ticker:
     # Dohvat podataka
-    stock = yf.Ticker(ticker)
-    hist = stock.history(period=period)
+    stock = get_ticker(ticker)
+    hist = run(stock.history, period=period)
     
     if not hist.empty:
         # --- IZRAČUN INDIKATORA ---
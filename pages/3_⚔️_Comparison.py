@@ -1,7 +1,13 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 
+from fundamentals import get_info, get_statements
+from http_session import map_tickers
+from peers import METRICS, open_peers
+from snapshot import MAX_AGE_DAYS
+from valuation import valuation_inputs, valuation_table
+from ui import VALUATION_COLUMNS
+
 st.set_page_config(page_title="Usporedba Dionica", layout="wide")
 
 st.title("⚔️ Usporedba Konkurencije")
@@ -10,6 +16,20 @@ st.markdown("Tablica s označenim financijskim zdravljem (Boje prema Rule #1 kri
 # --- INPUT ---
 tickers_input = st.text_input("Upiši simbole za usporedbu (odvojene zarezom):", "CRM, MSFT, ORCL, ADBE, SAP, NOW")
 
+show_val = st.checkbox("💰 Batch valuacija", help="DCF, Lynch, Graham i Rule #1 Sticker/MOS za sve simbole.")
+if show_val:
+    with st.expander("🧮 Parametri valuacije", expanded=True):
+        v1, v2, v3, v4 = st.columns(4)
+        val_auto = v1.checkbox("Automatski rast", value=True, help="Povijesni rast EPS-a po simbolu")
+        val_growth = v1.number_input("Rast (%):", value=15.0, step=1.0, disabled=val_auto)
+        val_disc = v2.number_input("Diskontna stopa (%):", value=10.0, step=0.5)
+        val_tpe = v3.number_input("Terminalni P/E:", value=15.0, step=1.0)
+        val_fpe = v4.number_input("Budući P/E (Rule #1):", value=30.0, step=1.0)
+
+show_pct = st.checkbox("📊 Percentil unutar sektora", help="Rang metrika naspram spremljenih sektorskih/industrijskih distribucija.")
+if show_pct:
+    pct_level = st.radio("Grupa konkurenata:", ["Industrija", "Sektor"], horizontal=True)
+
 if st.button("🚀 Usporedi", type="primary"):
     tickers = [t.strip().upper() for t in tickers_input.split(',') if t.strip()]
     
@@ -17,12 +37,19 @@ if st.button("🚀 Usporedi", type="primary"):
         st.warning("Upiši barem jedan simbol.")
     else:
         data = []
+        val_inputs = []
+        infos = []
         progress_bar = st.progress(0)
         
-        for i, t in enumerate(tickers):
+        def fetch(ticker):
+            # Godišnji izvještaji samo za valuaciju (isti povijesni rast kao na Screeneru)
+            return get_info(ticker), get_statements(ticker) if show_val else None
+
+        # Dohvat info podataka paralelno kroz dijeljenu HTTP sesiju
+        for i, (t, fetched, err) in enumerate(map_tickers(fetch, tickers)):
             try:
-                stock = yf.Ticker(t)
-                info = stock.info
+                if err is not None: raise err
+                info, statements = fetched
                 
                 # Priprema podataka (Čuvamo ih kao BROJEVE radi bojanja)
                 
@@ -61,6 +88,8 @@ if st.button("🚀 Usporedi", type="primary"):
                     "An. Rec": info.get('recommendationKey', '-').replace('_', ' ').title()
                 }
                 data.append(row)
+                if show_val: val_inputs.append(valuation_inputs(t, info, statements[0], statements[1]))
+                infos.append(info)
             except:
                 pass 
             
@@ -123,6 +152,49 @@ if st.button("🚀 Usporedi", type="primary"):
             🟡 **Žuto:** Srednje 
             🔴 **Crveno:** Oprez
             """)
+
+            if show_pct:
+                st.subheader("📊 Percentil unutar konkurencije")
+                peers = open_peers()
+                if peers is None:
+                    st.info(f"Nema svježih sektorskih distribucija (starije od {MAX_AGE_DAYS} dana se ne koriste). Pokreni: `python peers.py --file universe.txt`")
+                else:
+                    level = "industry" if pct_level == "Industrija" else "sector"
+                    pct_rows = []
+                    for row, info in zip(data, infos):
+                        pct_row = {"Ticker": row["Ticker"], "Grupa": info.get(level, '-')}
+                        n_max = 0
+                        for m in METRICS:
+                            pct, n = peers.percentile(row[m], info, m, level)
+                            pct_row[m] = pct
+                            n_max = max(n_max, n)
+                        pct_row["Konkurenata"] = n_max
+                        pct_rows.append(pct_row)
+                    pct_df = pd.DataFrame(pct_rows)
+
+                    def color_pct(val):
+                        if pd.isna(val): return None
+                        if val >= 67: return 'color: #4CAF50; font-weight: bold'
+                        elif val >= 33: return 'color: #FFC107; font-weight: bold'
+                        return 'color: #FF5252; font-weight: bold'
+
+                    pct_styler = pct_df.style.format({m: "{:.0f}" for m in METRICS}, na_rep="-")
+                    try:
+                        pct_styler.map(color_pct, subset=list(METRICS))
+                    except:
+                        pct_styler.applymap(color_pct, subset=list(METRICS))
+                    st.dataframe(pct_styler, use_container_width=True, hide_index=True)
+                    st.caption(f"📦 Distribucije od {peers.snapshot_date}. Percentil: 100 = najbolji u grupi (za P/E i Debt/Eq niže je bolje). Industrija s premalo konkurenata koristi sektor.")
+
+            if show_val:
+                st.subheader("💰 Batch Valuacija")
+                val_df = valuation_table(pd.DataFrame(val_inputs), val_disc, val_tpe, val_fpe, growth=None if val_auto else val_growth)
+                st.dataframe(
+                    val_df,
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config=VALUATION_COLUMNS,
+                )
             
         else:
             st.error("Nema podataka za odabrane simbole.")
@@ -0,0 +1,118 @@
+import datetime as dt
+import functools
+import os
+from pathlib import Path
+
+import numpy as np
+
+from http_session import get_ticker, map_tickers
+from snapshot import MAX_AGE_DAYS, SNAPSHOT_DIR, latest_date, partition_dir, universe_args
+
+# Sektorske/industrijske distribucije metrika za percentilni rang na stranici Usporedba.
+# Za svaku grupu spremamo sortirani niz vrijednosti, pa je percentil jedan binarni search
+# (np.searchsorted) - nije potrebno dohvaćati stotine konkurenata uživo.
+PEERS_FILE = "peers.npz"
+MIN_PEERS = 10  # manje od ovoga -> industrija pada na sektor
+
+# Stupac na stranici Usporedba -> (ključ u stock.info, faktor, veće = bolje)
+METRICS = {
+    "ROE": ('returnOnEquity', 100, True),
+    "Gross M": ('grossMargins', 100, True),
+    "Oper M": ('operatingMargins', 100, True),
+    "Profit M": ('profitMargins', 100, True),
+    "P/E": ('trailingPE', 1, False),
+    "Debt/Eq": ('debtToEquity', 0.01, False),
+    "Quick": ('quickRatio', 1, True),
+}
+
+LEVELS = ("sector", "industry")
+
+def metric_values(info):
+    """info -> {stupac: vrijednost} u istim jedinicama kao tablica Usporedbe"""
+    out = {}
+    for col, (key, factor, _) in METRICS.items():
+        v = info.get(key)
+        if isinstance(v, (int, float)) and np.isfinite(v):
+            out[col] = v * factor
+    return out
+
+def build_distributions(infos):
+    """
+    infos: {ticker: info}
+    Vraća {"level|grupa|metrika": sortirani float64 niz}.
+    """
+    buckets = {}
+    for info in infos.values():
+        if not info: continue
+        values = metric_values(info)
+        for level in LEVELS:
+            group = info.get(level)
+            if not group: continue
+            for col, v in values.items():
+                # Negativni P/E nema smisla rangirati
+                if col == "P/E" and v <= 0: continue
+                buckets.setdefault(f"{level}|{group}|{col}", []).append(v)
+    return {k: np.sort(np.asarray(v, dtype=np.float64)) for k, v in buckets.items()}
+
+def write_distributions(dists, snapshot_date=None, root=SNAPSHOT_DIR):
+    snapshot_date = snapshot_date or dt.date.today().isoformat()
+    part = partition_dir(snapshot_date, root)
+    part.mkdir(parents=True, exist_ok=True)
+    path = part / PEERS_FILE
+    tmp = part / (PEERS_FILE + ".tmp")
+    # Nazivi grupa mogu sadržavati '/' pa ih ne koristimo kao imena nizova u npz
+    keys = list(dists)
+    with open(tmp, "wb") as f:
+        np.savez(f, keys=np.array(keys, dtype=str), **{f"d{i}": dists[k] for i, k in enumerate(keys)})
+    os.replace(tmp, path)
+    return path
+
+class PeerDistributions:
+    def __init__(self, path):
+        self.snapshot_date = Path(path).parent.name.split("=", 1)[1]
+        with np.load(path) as data:
+            self._dists = {str(k): data[f"d{i}"] for i, k in enumerate(data["keys"])}
+
+    def peers(self, level, group, metric):
+        return self._dists.get(f"{level}|{group}|{metric}")
+
+    def percentile(self, value, info, metric, level="industry"):
+        """
+        Percentil (0-100) vrijednosti unutar grupe simbola; veće = bolje (za P/E i D/E je obrnuto).
+        Vraća (percentil, broj konkurenata) ili (None, 0) ako nema dovoljno podataka.
+        """
+        if not isinstance(value, (int, float)) or not np.isfinite(value): return None, 0
+        if metric == "P/E" and value <= 0: return None, 0
+        arr = None
+        # Industrija s premalo konkurenata -> sektor
+        for lvl in ("industry", "sector") if level == "industry" else ("sector",):
+            arr = self.peers(lvl, info.get(lvl), metric)
+            if arr is not None and len(arr) >= MIN_PEERS: break
+            arr = None
+        if arr is None: return None, 0
+
+        # Srednji rang za jednake vrijednosti
+        lo = np.searchsorted(arr, value, side="left")
+        hi = np.searchsorted(arr, value, side="right")
+        pct = (lo + hi) / 2 / len(arr) * 100
+        if not METRICS[metric][2]: pct = 100 - pct
+        return pct, len(arr)
+
+@functools.lru_cache(maxsize=2)
+def _open(path, mtime):
+    return PeerDistributions(path)
+
+def open_peers(root=SNAPSHOT_DIR, max_age_days=MAX_AGE_DAYS):
+    """Zadnje spremljene distribucije (None ako ih nema ili su starije od max_age_days, kao snapshot)"""
+    snapshot_date = latest_date(root, PEERS_FILE, max_age_days)
+    if snapshot_date is None: return None
+    path = partition_dir(snapshot_date, root) / PEERS_FILE
+    return _open(str(path), path.stat().st_mtime_ns)
+
+def build_peers(tickers, snapshot_date=None, root=SNAPSHOT_DIR):
+    """Dohvaća info za cijeli univerzum i sprema distribucije (za noćni batch)"""
+    infos = {t: info for t, info, err in map_tickers(lambda s: get_ticker(s).info, list(tickers)) if err is None}
+    return write_distributions(build_distributions(infos), snapshot_date, root)
+
+if __name__ == "__main__":
+    print(build_peers(*universe_args("Sektorske distribucije metrika (percentilni rang)")))
@@ -0,0 +1,196 @@
+import argparse
+import datetime as dt
+import functools
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from http_session import get_ticker, map_tickers
+
+# Dnevni snapshot izvještaja za cijeli univerzum u jednom stupčastom (Arrow IPC) fileu:
+#   snapshots/snapshot_date=YYYY-MM-DD/fundamentals.arrow
+# Redovi su dugi format (ticker, statement, item, period, value), složeni po simbolu pa izvještaju,
+# a pomaci svakog bloka (start, broj redaka, broj perioda) stoje u metapodacima sheme.
+# Arrow IPC bez kompresije se može memory-mapirati, pa čitanje ne kopira podatke.
+SNAPSHOT_DIR = Path(__file__).parent / "snapshots"
+SNAPSHOT_FILE = "fundamentals.arrow"
+# Stariji snapshot se ignorira (npr. noćni build je prestao raditi) - stranice tada idu na žive podatke
+MAX_AGE_DAYS = 3
+
+# Isti redoslijed kao app.get_data
+STATEMENTS = (
+    "financials", "balance_sheet", "cashflow",
+    "quarterly_financials", "quarterly_balance_sheet", "quarterly_cashflow",
+)
+
+SCHEMA = pa.schema([
+    ("ticker", pa.dictionary(pa.int32(), pa.string())),
+    ("statement", pa.dictionary(pa.int8(), pa.string())),
+    ("item", pa.dictionary(pa.int32(), pa.string())),
+    ("period", pa.timestamp("ns")),
+    ("value", pa.float64()),
+])
+
+def partition_dir(snapshot_date, root):
+    return Path(root) / f"snapshot_date={snapshot_date}"
+
+def write_snapshot(statements, snapshot_date=None, root=SNAPSHOT_DIR):
+    """
+    Zapisuje snapshot.
+    statements: {ticker: {naziv_izvještaja: DataFrame}} (DataFrame u yfinance obliku: retci = stavke, stupci = periodi).
+    Vraća putanju zapisanog filea.
+    """
+    snapshot_date = snapshot_date or dt.date.today().isoformat()
+    tickers, names, items, periods, values = [], [], [], [], []
+    blocks = {}
+    offset = 0
+
+    for ticker in sorted(statements):
+        for name in STATEMENTS:
+            df = statements[ticker].get(name)
+            if df is None or df.empty: continue
+            nrows, ncols = df.shape
+            size = nrows * ncols
+            # Pravokutni blok (NaN ostaje NaN), pa se kod čitanja samo preoblikuje
+            tickers.append(np.full(size, ticker, dtype=object))
+            names.append(np.full(size, name, dtype=object))
+            items.append(np.repeat(np.asarray(df.index, dtype=object), ncols))
+            periods.append(np.tile(pd.to_datetime(df.columns).values.astype("datetime64[ns]"), nrows))
+            values.append(df.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64).ravel())
+            blocks[f"{ticker}|{name}"] = [offset, nrows, ncols]
+            offset += size
+
+    def _dict_col(parts, index_type):
+        arr = pa.array(np.concatenate(parts) if parts else np.array([], dtype=object), type=pa.string())
+        return arr.dictionary_encode().cast(pa.dictionary(index_type, pa.string()))
+
+    table = pa.Table.from_arrays([
+        _dict_col(tickers, pa.int32()),
+        _dict_col(names, pa.int8()),
+        _dict_col(items, pa.int32()),
+        pa.array(np.concatenate(periods) if periods else np.array([], dtype="datetime64[ns]"), type=pa.timestamp("ns")),
+        pa.array(np.concatenate(values) if values else np.array([], dtype=np.float64), type=pa.float64()),
+    ], schema=SCHEMA.with_metadata({"blocks": json.dumps(blocks)}))
+
+    part = partition_dir(snapshot_date, root)
+    part.mkdir(parents=True, exist_ok=True)
+    path = part / SNAPSHOT_FILE
+    tmp = path.with_suffix(".tmp")
+    # Bez kompresije - inače memory-map ne bi bio zero-copy
+    with pa.OSFile(str(tmp), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+    return path
+
+def list_snapshots(root=SNAPSHOT_DIR, filename=SNAPSHOT_FILE):
+    """Datumi particija koje sadrže filename (najstariji prvi)"""
+    root = Path(root)
+    if not root.exists(): return []
+    return sorted(p.name.split("=", 1)[1] for p in root.glob("snapshot_date=*") if (p / filename).exists())
+
+def latest_date(root=SNAPSHOT_DIR, filename=SNAPSHOT_FILE, max_age_days=MAX_AGE_DAYS):
+    """Zadnji datum s filename, ili None ako ga nema ili je stariji od max_age_days (None = bez ograničenja)"""
+    dates = list_snapshots(root, filename)
+    if not dates: return None
+    if max_age_days is not None:
+        age = (dt.date.today() - dt.date.fromisoformat(dates[-1])).days
+        if age > max_age_days: return None
+    return dates[-1]
+
+class Snapshot:
+    """Memory-mapirani snapshot. Svi izvodi (slice) su pogledi na mapirani file, bez kopiranja."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.snapshot_date = self.path.parent.name.split("=", 1)[1]
+        self._source = pa.memory_map(str(self.path), "r")
+        self.table = pa.ipc.open_file(self._source).read_all()
+        self._blocks = json.loads(self.table.schema.metadata[b"blocks"])
+        self.tickers = sorted({k.split("|", 1)[0] for k in self._blocks})
+        self._ticker_set = set(self.tickers)
+
+    def __contains__(self, ticker):
+        return ticker in self._ticker_set
+
+    def rows(self, tickers, statements=STATEMENTS, columns=None):
+        """Dugi format za zadane simbole/izvještaje (Arrow tablica, zero-copy)"""
+        parts = []
+        for t in tickers:
+            for name in statements:
+                block = self._blocks.get(f"{t}|{name}")
+                if block is None: continue
+                start, nrows, ncols = block
+                parts.append(self.table.slice(start, nrows * ncols))
+        if not parts:
+            out = self.table.slice(0, 0)
+        else:
+            out = pa.concat_tables(parts)
+        return out.select(columns) if columns else out
+
+    def statement(self, ticker, name):
+        """Jedan izvještaj u yfinance obliku (retci = stavke, stupci = periodi)"""
+        block = self._blocks.get(f"{ticker}|{name}")
+        if block is None: return pd.DataFrame()
+        start, nrows, ncols = block
+        size = nrows * ncols
+        values = self.table.column("value").slice(start, size).combine_chunks().to_numpy(zero_copy_only=True)
+        items = self.table.column("item").slice(start, size).combine_chunks().dictionary_decode().to_numpy(zero_copy_only=False)[::ncols]
+        periods = self.table.column("period").slice(start, ncols).to_numpy()
+        return pd.DataFrame(values.reshape(nrows, ncols), index=pd.Index(items), columns=pd.DatetimeIndex(periods), copy=False)
+
+    def statements(self, ticker):
+        """Svih šest izvještaja, istim redoslijedom kao app.get_data (bez info)"""
+        return tuple(self.statement(ticker, name) for name in STATEMENTS)
+
+@functools.lru_cache(maxsize=2)
+def _open(path, mtime):
+    return Snapshot(path)
+
+def open_snapshot(snapshot_date=None, root=SNAPSHOT_DIR, max_age_days=MAX_AGE_DAYS):
+    """
+    Otvara snapshot (zadnji ako datum nije zadan). Vraća None ako ne postoji
+    ili ako je zadnji snapshot stariji od max_age_days (None = bez ograničenja).
+    Otvoreni snapshot se dijeli unutar procesa, a novi file (isti datum ili novi dan) se sam ponovno otvara.
+    """
+    if snapshot_date is None:
+        snapshot_date = latest_date(root, SNAPSHOT_FILE, max_age_days)
+        if snapshot_date is None: return None
+    path = partition_dir(snapshot_date, root) / SNAPSHOT_FILE
+    if not path.exists(): return None
+    return _open(str(path), path.stat().st_mtime_ns)
+
+def fetch_statements(ticker, names=STATEMENTS):
+    stock = get_ticker(ticker)
+    return {name: getattr(stock, name) for name in names}
+
+def build_snapshot(tickers, snapshot_date=None, root=SNAPSHOT_DIR):
+    """Dohvaća izvještaje za sve simbole i zapisuje dnevni snapshot (za noćni batch)"""
+    statements = {}
+    for t, fetched, err in map_tickers(fetch_statements, list(tickers)):
+        if err is None: statements[t] = fetched
+    return write_snapshot(statements, snapshot_date, root)
+
+def universe_args(description):
+    """
+    Zajednički CLI noćnih batch poslova (snapshot.py, peers.py): simboli kao argumenti i/ili --file.
+    Vraća (simboli, datum, root).
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("tickers", nargs="*", help="Simboli (ili --file)")
+    parser.add_argument("--file", help="File sa simbolima (jedan po retku ili odvojeni zarezom)")
+    parser.add_argument("--date", help="Datum (YYYY-MM-DD), zadano danas")
+    parser.add_argument("--root", default=str(SNAPSHOT_DIR))
+    args = parser.parse_args()
+
+    tickers = list(args.tickers)
+    if args.file: tickers += Path(args.file).read_text().replace(",", "\n").splitlines()
+    tickers = [t.strip().upper() for t in tickers if t.strip()]
+    return tickers, args.date, args.root
+
+if __name__ == "__main__":
+    print(build_snapshot(*universe_args("Dnevni snapshot izvještaja (Arrow IPC)")))
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+
+from http_session import POOL_MAXSIZE, download, map_tickers
+from scoring import SCORE_INFO_KEYS
+
+# TTM brojke iz zadnja 4 kvartalna izvještaja, umjesto sporog (i throttlanog) stock.info.
+# Sve se računa odjednom za cijeli univerzum: izvještaji svih simbola se slože u jednu tablicu
+# (ticker, stavka) x kvartal, pa je svaki korak jedna vektorska operacija.
+
+# Tokovi (income/cashflow) -> zbroj zadnja 4 kvartala. Kandidati redom, prvi pronađeni pobjeđuje.
+FLOW_ITEMS = {
+    'totalRevenue': ('fin', ['Total Revenue', 'Operating Revenue']),
+    'netIncomeToCommon': ('fin', ['Net Income Common Stockholders', 'Net Income']),
+    'freeCashflow': ('cf', ['Free Cash Flow']),
+    'operatingCashflow': ('cf', ['Operating Cash Flow']),
+    'capitalExpenditure': ('cf', ['Capital Expenditure']),
+    'dividendsPaid': ('cf', ['Cash Dividends Paid', 'Common Stock Dividend Paid']),
+}
+
+# Stanja (bilanca) -> zadnja dostupna vrijednost
+STOCK_ITEMS = {
+    'totalCash': ('bal', ['Cash Cash Equivalents And Short Term Investments', 'Cash And Cash Equivalents']),
+    'totalDebt': ('bal', ['Total Debt']),
+    'sharesOutstanding': ('bal', ['Ordinary Shares Number', 'Share Issued']),
+    'stockholdersEquity': ('bal', ['Stockholders Equity']),
+}
+
+# Bez ovih se simbol ne može bodovati iz kvartala -> fallback na stock.info
+REQUIRED = ('currentPrice', 'totalRevenue', 'netIncomeToCommon', 'totalCash', 'sharesOutstanding')
+
+def _stack(frames):
+    """{ticker: df} -> tablica s indeksom (ticker, item) i stupcima 0..n (0 = najnoviji kvartal)"""
+    parts = {t: df.set_axis(range(df.shape[1]), axis=1) for t, df in frames.items() if df is not None and not df.empty}
+    if not parts: return pd.DataFrame(index=pd.MultiIndex.from_tuples([], names=['ticker', 'item']))
+    out = pd.concat(parts, names=['ticker', 'item'])
+    out = out[~out.index.duplicated()]
+    return out.apply(pd.to_numeric, errors='coerce')
+
+def _pick(wide, tickers, candidates):
+    """Prvi dostupni redak od kandidata, po simbolu"""
+    res = pd.Series(np.nan, index=tickers)
+    for item in reversed(candidates):
+        if item in wide.columns:
+            res = wide[item].reindex(tickers).combine_first(res)
+    return res
+
+def derive_ttm(quarterly):
+    """
+    quarterly: {ticker: (fin_q, bal_q, cf_q)}
+    Vraća DataFrame (ticker x polje) s TTM tokovima i zadnjim stanjima bilance.
+    """
+    tickers = list(quarterly)
+    stacked = {
+        'fin': _stack({t: q[0] for t, q in quarterly.items()}),
+        'bal': _stack({t: q[1] for t, q in quarterly.items()}),
+        'cf': _stack({t: q[2] for t, q in quarterly.items()}),
+    }
+
+    # Zadnji prozor od 4 kvartala (min_count=4: ako fali kvartal, nema TTM-a)
+    flows = {k: df.iloc[:, :4].sum(axis=1, min_count=4).unstack('item') if df.shape[1] >= 4 else pd.DataFrame()
+             for k, df in stacked.items() if k != 'bal'}
+    # Zadnja valjana vrijednost (ako je najnoviji kvartal prazan, uzmi prethodni)
+    bal = stacked['bal']
+    latest = bal.bfill(axis=1).iloc[:, 0].unstack('item') if bal.shape[1] else pd.DataFrame()
+
+    out = pd.DataFrame(index=tickers)
+    for field, (src, candidates) in FLOW_ITEMS.items():
+        out[field] = _pick(flows[src], tickers, candidates)
+    for field, (src, candidates) in STOCK_ITEMS.items():
+        out[field] = _pick(latest, tickers, candidates)
+
+    # FCF fallback: OCF + CapEx (CapEx je negativan)
+    out['freeCashflow'] = out['freeCashflow'].combine_first(out['operatingCashflow'] + out['capitalExpenditure'])
+    return out
+
+def _download_close(tickers):
+    # threads=False: paralelizam dolazi iz dugoživućih HTTP niti, a ne iz novih niti yf.downloada
+    data = download(tickers, period='5d', progress=False, auto_adjust=False, threads=False)
+    if data is None or data.empty: return pd.DataFrame(columns=list(tickers))
+    close = data['Close']
+    if isinstance(close, pd.Series): close = close.to_frame(tickers[0])
+    return close
+
+def bulk_prices(tickers):
+    """Zadnja cijena za sve simbole (yf.download u komadima, na HTTP nitima)"""
+    if not tickers: return pd.Series(dtype=float)
+    size = max(1, -(-len(tickers) // POOL_MAXSIZE))
+    chunks = [tuple(tickers[i:i + size]) for i in range(0, len(tickers), size)]
+    closes = [close for _, close, err in map_tickers(_download_close, chunks) if err is None and not close.empty]
+    if not closes: return pd.Series(np.nan, index=tickers)
+    close = pd.concat(closes, axis=1)
+    close = close.loc[:, ~close.columns.duplicated()]
+    return close.ffill().iloc[-1].reindex(tickers)
+
+def ttm_infos(ttm, prices):
+    """
+    Slaže info rječnike (isti ključevi kao stock.info koje koristi bodovanje) iz TTM tablice i cijena.
+    Vraća samo simbole s kompletnim podacima - ostali idu na fallback (stock.info).
+    """
+    df = ttm.copy()
+    df['currentPrice'] = prices.reindex(df.index)
+    df['marketCap'] = df['currentPrice'] * df['sharesOutstanding']
+    eps = df['netIncomeToCommon'] / df['sharesOutstanding']
+    df['trailingPE'] = (df['currentPrice'] / eps).where(eps > 0)
+    df['returnOnEquity'] = (df['netIncomeToCommon'] / df['stockholdersEquity']).where(df['stockholdersEquity'] > 0)
+    div_paid = df['dividendsPaid'].abs().fillna(0)
+    df['dividendRate'] = div_paid / df['sharesOutstanding']
+    df['payoutRatio'] = (div_paid / df['netIncomeToCommon']).where(df['netIncomeToCommon'] > 0)
+
+    df = df[df[list(REQUIRED)].notna().all(axis=1)]
+    keys = [k for k in SCORE_INFO_KEYS if k in df.columns]
+    infos = {}
+    for t, row in zip(df.index, df[keys].to_dict('records')):
+        # Bez shortName - naziv tvrtke nije u izvještajima (Screener u brzom načinu ne prikazuje Name)
+        infos[t] = {k: float(v) for k, v in row.items() if pd.notna(v)}
+    return infos
@@ -0,0 +1,9 @@
+import streamlit as st
+
+# Zajednički Streamlit formati stupaca (Screener i Usporedba)
+
+VALUATION_COLUMNS = {
+    c: st.column_config.NumberColumn(c, format="$%.2f") for c in ["Price", "EPS", "BVPS", "DCF", "Lynch", "Graham", "Sticker", "MOS Price"]
+} | {
+    c: st.column_config.NumberColumn(c, format="%.1f%%") for c in ["Growth %", "MOS DCF %", "MOS Lynch %", "MOS Graham %", "MOS Sticker %"]
+}
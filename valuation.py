@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+# Valuacije s glavne stranice (DCF, Peter Lynch, Graham Number, Rule #1 Sticker/MOS)
+# kao numpy operacije nad stupcima - isti kod radi za jedan simbol i za tisuće odjednom.
+
+MAX_GROWTH = 30.0  # Gornja granica automatskog rasta (%), da jedna dobra godina ne napuše valuaciju
+
+def dcf_value(eps, growth_rate, discount_rate, terminal_multiple, years=10):
+    """Isto kao calculate_dcf, ali nad nizovima (growth/discount u %)"""
+    eps = np.asarray(eps, dtype=float)
+    g = 1 + np.asarray(growth_rate, dtype=float) / 100
+    d = 1 + np.asarray(discount_rate, dtype=float) / 100
+    i = np.arange(1, years + 1)
+    # sum_{i=1..n} eps * g^i / d^i
+    ratio = np.expand_dims(g / d, -1)
+    discounted_sum = eps * (ratio ** i).sum(axis=-1)
+    terminal_discounted = eps * g ** years * terminal_multiple / d ** years
+    return discounted_sum + terminal_discounted
+
+def lynch_value(eps, growth_rate):
+    return np.asarray(eps, dtype=float) * np.asarray(growth_rate, dtype=float)
+
+def graham_number(eps, bvps):
+    """NaN ako EPS/BVPS nedostaje, 0 za negativne ulaze (kao na glavnoj stranici)"""
+    eps = np.asarray(eps, dtype=float)
+    bvps = np.asarray(bvps, dtype=float)
+    ok = (eps > 0) & (bvps > 0)
+    missing = np.isnan(eps) | np.isnan(bvps)
+    return np.where(missing, np.nan, np.where(ok, np.sqrt(np.where(ok, 22.5 * eps * bvps, 0)), 0))
+
+def rule1_prices(eps, growth_rate, future_pe, years=10):
+    """Rule #1: (Future EPS, Future Price, Sticker, MOS)"""
+    fut_eps = np.asarray(eps, dtype=float) * (1 + np.asarray(growth_rate, dtype=float) / 100) ** years
+    fut_price = fut_eps * future_pe
+    # Sticker = Future Price / 4 (approx 15% discount over 10y), MOS = Sticker / 2
+    sticker = fut_price / 4
+    return fut_eps, fut_price, sticker, sticker / 2
+
+def historical_growth(fin):
+    """CAGR EPS-a (ili Net Incomea) iz godišnjih izvještaja, u %. None ako nema smislenih podataka."""
+    if fin is None or fin.empty: return None
+    for row in ['Diluted EPS', 'Basic EPS', 'Net Income']:
+        if row not in fin.index: continue
+        vals = pd.to_numeric(fin.loc[row], errors='coerce').dropna()
+        if len(vals) < 2: continue
+        new, old = vals.iloc[0], vals.iloc[-1]
+        if new <= 0 or old <= 0: return None
+        return ((new / old) ** (1 / (len(vals) - 1)) - 1) * 100
+    return None
+
+def valuation_inputs(ticker, info, fin=None, bal=None):
+    """Jedan redak ulaza (Price, EPS, BVPS, Growth) iz info + izvještaja"""
+    price = info.get('currentPrice')
+    shares = info.get('sharesOutstanding')
+
+    eps = info.get('trailingEps')
+    if eps is None and info.get('netIncomeToCommon') is not None and shares:
+        eps = info['netIncomeToCommon'] / shares
+
+    bvps = info.get('bookValue')
+    if bvps is None and bal is not None and 'Stockholders Equity' in bal.index and shares:
+        bvps = bal.loc['Stockholders Equity'].iloc[0] / shares
+
+    growth = historical_growth(fin)
+    if growth is None and info.get('earningsGrowth') is not None:
+        growth = info['earningsGrowth'] * 100
+
+    return {"Ticker": ticker, "Price": price, "EPS": eps, "BVPS": bvps, "Growth %": growth}
+
+def valuation_table(inputs, discount_rate=10.0, terminal_pe=15.0, future_pe=30.0, growth=None):
+    """
+    inputs: DataFrame (Ticker, Price, EPS, BVPS, Growth %).
+    growth: fiksni rast za sve simbole (%), inače automatski po simbolu (ograničen na 0..MAX_GROWTH).
+    Vraća tablicu s četiri valuacije i marginom sigurnosti (%) naspram trenutne cijene.
+    """
+    df = inputs.copy()
+    for c in ["Price", "EPS", "BVPS", "Growth %"]:
+        df[c] = pd.to_numeric(df[c], errors='coerce')
+    if growth is not None: df["Growth %"] = float(growth)
+    else: df["Growth %"] = df["Growth %"].clip(0, MAX_GROWTH)
+
+    eps = df["EPS"].to_numpy()
+    g = df["Growth %"].to_numpy()
+    price = df["Price"].to_numpy()
+
+    df["DCF"] = dcf_value(eps, g, discount_rate, terminal_pe)
+    df["Lynch"] = lynch_value(eps, g)
+    df["Graham"] = graham_number(eps, df["BVPS"].to_numpy())
+    _, _, df["Sticker"], df["MOS Price"] = rule1_prices(eps, g, future_pe)
+
+    # Margina sigurnosti: koliko je cijena ispod fer vrijednosti (negativno = precijenjeno)
+    for c in ["DCF", "Lynch", "Graham", "Sticker"]:
+        value = df[c].to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            df[f"MOS {c} %"] = np.where(value > 0, (value - price) / value * 100, np.nan)
+    df["Ispod MOS"] = price <= df["MOS Price"].to_numpy()
+    return df